@@ -1,8 +1,18 @@
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
+# 可选的 Cython 加速扩展：未安装 Cython 或编译失败时使用纯 Python 实现
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension("procast._wrap", ["src/procast/_wrap.pyx"], optional=True)]
+    )
+
 setup(
     name="procast",
     version="0.1.0",
@@ -13,6 +23,7 @@ setup(
     url="https://github.com/SmallWhitesail1320911490/procast",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -39,6 +50,11 @@ setup(
         "typer[all]",
         "pyyaml",
     ],
+    extras_require={
+        "speedups": ["orjson", "blake3", "h2"],
+        "faster-whisper": ["faster-whisper"],
+        "vad": ["silero-vad"],
+    },
     entry_points={
         "console_scripts": [
             "procast=procast.cli:app",
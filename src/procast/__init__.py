@@ -7,12 +7,22 @@ ProCast - 播客金句提取与卡片生成工具
 __version__ = "0.1.0"
 __author__ = "SmallWhitesail"
 
-from .transcriber import AudioTranscriber
-from .extractor import QuoteExtractor
-from .card_generator import CardGenerator
-
 __all__ = [
     "AudioTranscriber",
     "QuoteExtractor", 
     "CardGenerator",
 ]
+
+
+def __getattr__(name):
+    # 按需导入子模块，避免 `procast version` 等命令也加载 whisper/torch 等重量级依赖
+    if name == "AudioTranscriber":
+        from .transcriber import AudioTranscriber
+        return AudioTranscriber
+    if name == "QuoteExtractor":
+        from .extractor import QuoteExtractor
+        return QuoteExtractor
+    if name == "CardGenerator":
+        from .card_generator import CardGenerator
+        return CardGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,43 @@
+"""
+JSON 读写辅助模块
+安装了 orjson 时使用 orjson（更快），否则回退到标准库 json
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析 JSON 字符串或字节串"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    序列化为缩进 2 格、非 ASCII 字符原样输出的 UTF-8 JSON
+
+    Args:
+        obj: 要序列化的对象
+        default: 无法直接序列化的对象的转换函数
+
+    Returns:
+        UTF-8 编码的 JSON 字节串
+    """
+    if orjson:
+        return orjson.dumps(
+            obj,
+            default=default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=default).encode("utf-8")
+
+
+def write(path: Union[str, Path], obj: Any, default: Optional[Callable[[Any], Any]] = None):
+    """将对象以 JSON 格式写入文件"""
+    Path(path).write_bytes(dumps(obj, default=default))
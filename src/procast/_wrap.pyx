@@ -0,0 +1,41 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+中文换行的编译加速实现
+
+逻辑与 card_generator.CardGenerator._wrap_text 中的纯 Python 分支一致，
+未编译时会自动回退到纯 Python 实现。
+"""
+
+
+def wrap_cjk(list advances, double max_width):
+    """
+    按字形宽度切分行
+    
+    Args:
+        advances: 每个字符的宽度
+        max_width: 最大行宽
+    
+    Returns:
+        每行的 (起始下标, 结束下标) 列表
+    """
+    cdef Py_ssize_t n = len(advances)
+    cdef Py_ssize_t start = 0
+    cdef Py_ssize_t i
+    cdef double width = 0
+    cdef double advance
+    cdef list spans = []
+    
+    for i in range(n):
+        advance = advances[i]
+        if width + advance <= max_width:
+            width += advance
+        else:
+            if i > start:
+                spans.append((start, i))
+            start = i
+            width = advance
+    
+    if n > start:
+        spans.append((start, n))
+    
+    return spans
@@ -3,14 +3,74 @@
 使用 Pillow 生成精美的金句分享卡片
 """
 
+import functools
 import os
+import queue
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 from rich.console import Console
 
+try:
+    from ._wrap import wrap_cjk
+except ImportError:
+    wrap_cjk = None
+
 console = Console()
 
+# 卡片数量达到该值时才启用多进程渲染，避免小批量时进程启动开销得不偿失
+PARALLEL_MIN_CARDS = 8
+
+# 顺序生成时用于后台编码保存图片的线程数
+SAVE_WORKERS = 2
+
+# 每个生成器最多保留的空闲画布数：正在保存的和正在绘制的卡片各占一块
+CANVAS_POOL_SIZE = SAVE_WORKERS + 1
+
+# CJK 统一汉字，用于选择按字符还是按单词换行
+_CJK_RE = re.compile('[\u4e00-\u9fff]')
+
+# 未指定字体或字体加载失败时依次尝试的系统字体
+_SYSTEM_FONT_CANDIDATES = (
+    "/System/Library/Fonts/PingFang.ttc",  # macOS
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",  # Linux
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Linux
+    "C:\\Windows\\Fonts\\msyh.ttc",  # Windows
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_system_fonts() -> Tuple[str, ...]:
+    """检测本机存在的系统字体（每个进程只检查一次文件系统）"""
+    return tuple(font for font in _SYSTEM_FONT_CANDIDATES if os.path.exists(font))
+
+
+@functools.lru_cache(maxsize=32)
+def _get_font(font_path: Optional[str], size: int) -> ImageFont.ImageFont:
+    """
+    加载字体（进程内按路径和字号缓存）
+    
+    同一字体在多个 CardGenerator 之间共享，避免重复解析字体文件。
+    """
+    if font_path and os.path.exists(font_path):
+        try:
+            return ImageFont.truetype(font_path, size)
+        except Exception as e:
+            console.print(f"⚠ 无法加载字体 {font_path}: {e}", style="yellow")
+    
+    # 尝试使用系统字体
+    for font in _detect_system_fonts():
+        try:
+            return ImageFont.truetype(font, size)
+        except:
+            continue
+    
+    # 使用默认字体
+    return ImageFont.load_default()
+
 
 class CardGenerator:
     """金句卡片生成器"""
@@ -24,7 +84,8 @@ class CardGenerator:
         accent_color: str = "#e94560",
         font_path: Optional[str] = None,
         font_size: int = 48,
-        padding: int = 100
+        padding: int = 100,
+        output_format: str = "png"
     ):
         """
         初始化卡片生成器
@@ -38,6 +99,7 @@ class CardGenerator:
             font_path: 字体文件路径
             font_size: 字体大小
             padding: 内边距
+            output_format: 批量生成时的图片格式 (png, jpg, webp)
         """
         self.width = width
         self.height = height
@@ -45,42 +107,78 @@ class CardGenerator:
         self.text_color = text_color
         self.accent_color = accent_color
         self.padding = padding
+        self.output_format = output_format.lower().lstrip(".")
+        
+        # 预先解析颜色，避免每次绘制时重复转换
+        self._bg_rgb = self._hex_to_rgb(background_color)
+        self._text_rgb = self._hex_to_rgb(text_color)
+        self._accent_rgb = self._hex_to_rgb(accent_color)
+        
+        # 构造参数，用于在子进程中重建生成器
+        self._init_kwargs = {
+            "width": width,
+            "height": height,
+            "background_color": background_color,
+            "text_color": text_color,
+            "accent_color": accent_color,
+            "font_path": font_path,
+            "font_size": font_size,
+            "padding": padding,
+            "output_format": output_format,
+        }
+        
+        # 最近一次使用的卡片模板，按 (标题, 风格) 复用
+        self._template: Optional[Image.Image] = None
+        self._template_key: Optional[Tuple[str, str]] = None
+        
+        # 可复用的画布，避免每张卡片重新分配整幅图像
+        self._canvas_pool: queue.Queue = queue.Queue(maxsize=CANVAS_POOL_SIZE)
+        
+        # 字形宽度缓存：{id(font): {字符或单词: 宽度}}
+        self._advance_cache: Dict[int, Dict[str, float]] = {}
         
         # 加载字体
         self.font = self._load_font(font_path, font_size)
         self.title_font = self._load_font(font_path, int(font_size * 0.6))
         self.small_font = self._load_font(font_path, int(font_size * 0.5))
+        self.quote_mark_font = self._load_font(font_path, 120)
+        
+        # 金句正文行距：字号的 1.5 倍，优雅风格为 1.6 倍
+        self._line_spacing = self._multiline_spacing(int(font_size * 1.5))
+        self._elegant_line_spacing = self._multiline_spacing(int(font_size * 1.6))
     
     def _load_font(self, font_path: Optional[str], size: int) -> ImageFont.ImageFont:
         """加载字体"""
-        if font_path and os.path.exists(font_path):
-            try:
-                return ImageFont.truetype(font_path, size)
-            except Exception as e:
-                console.print(f"⚠ 无法加载字体 {font_path}: {e}", style="yellow")
-        
-        # 尝试使用系统字体
-        system_fonts = [
-            "/System/Library/Fonts/PingFang.ttc",  # macOS
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",  # Linux
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Linux
-            "C:\\Windows\\Fonts\\msyh.ttc",  # Windows
-        ]
-        
-        for font in system_fonts:
-            if os.path.exists(font):
-                try:
-                    return ImageFont.truetype(font, size)
-                except:
-                    continue
-        
-        # 使用默认字体
-        return ImageFont.load_default()
+        # 字体发生变化，旧的字形宽度不再可信
+        self._advance_cache.clear()
+        return _get_font(font_path, size)
     
     def _hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """将十六进制颜色转换为 RGB"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return tuple(bytes.fromhex(hex_color.lstrip('#')))
+    
+    def _fill_rect(
+        self,
+        img: Image.Image,
+        box: Tuple[int, int, int, int],
+        rgb: Tuple[int, int, int]
+    ):
+        """
+        填充实心矩形
+        
+        直接写入图像缓冲区，比 ImageDraw.rectangle 的通用绘制路径更快。
+        box 的含义与 draw.rectangle 相同，右下角坐标包含在内。
+        """
+        x0, y0, x1, y1 = box
+        img.paste(rgb, (x0, y0, x1 + 1, y1 + 1))
+    
+    def _multiline_spacing(self, line_height: int) -> int:
+        """
+        计算 multiline_text 的 spacing 参数
+        
+        Pillow 的行距为 "A" 的高度加上 spacing，这里换算成相邻两行之间固定间隔 line_height。
+        """
+        return line_height - self.font.getbbox("A")[3]
     
     def _wrap_text(
         self,
@@ -90,42 +188,72 @@ class CardGenerator:
     ) -> list:
         """自动换行"""
         lines = []
-        words = text
+        cache = self._advance_cache.setdefault(id(font), {})
         
         # 对于中文，按字符分割
-        if any('\u4e00' <= char <= '\u9fff' for char in text):
-            # 中文文本
-            current_line = ""
+        if _CJK_RE.search(text):
+            if wrap_cjk is not None:
+                # 使用编译后的换行实现：先补齐缺失的字形宽度，再按下标切分
+                for char in set(text).difference(cache):
+                    cache[char] = font.getlength(char)
+                advances = list(map(cache.__getitem__, text))
+                return [text[start:end] for start, end in wrap_cjk(advances, max_width)]
+            
+            # 中文文本：逐字累加宽度，只在换行时拼接字符串
+            current_chars = []
+            current_width = 0
+            
+            # 循环内只使用局部变量，避免逐字符的属性查找
+            get_advance = cache.get
+            getlength = font.getlength
+            append_char = current_chars.append
+            append_line = lines.append
+            
             for char in text:
-                test_line = current_line + char
-                bbox = font.getbbox(test_line)
-                width = bbox[2] - bbox[0]
+                advance = get_advance(char)
+                if advance is None:
+                    advance = cache[char] = getlength(char)
                 
-                if width <= max_width:
-                    current_line = test_line
+                if current_width + advance <= max_width:
+                    append_char(char)
+                    current_width += advance
                 else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = char
+                    if current_chars:
+                        append_line("".join(current_chars))
+                        current_chars.clear()
+                    append_char(char)
+                    current_width = advance
             
-            if current_line:
-                lines.append(current_line)
+            if current_chars:
+                lines.append("".join(current_chars))
         else:
-            # 英文文本
+            # 英文文本：缓存单词宽度，行宽 = 单词宽度之和 + 空格宽度
+            space_width = cache.get(" ")
+            if space_width is None:
+                space_width = cache[" "] = font.getlength(" ")
+            
             words = text.split()
             current_line = ""
+            current_width = 0
             
             for word in words:
-                test_line = current_line + " " + word if current_line else word
-                bbox = font.getbbox(test_line)
-                width = bbox[2] - bbox[0]
+                word_width = cache.get(word)
+                if word_width is None:
+                    word_width = cache[word] = font.getlength(word)
+                
+                if current_line:
+                    width = current_width + space_width + word_width
+                else:
+                    width = word_width
                 
                 if width <= max_width:
-                    current_line = test_line
+                    current_line = current_line + " " + word if current_line else word
+                    current_width = width
                 else:
                     if current_line:
                         lines.append(current_line)
                     current_line = word
+                    current_width = word_width
             
             if current_line:
                 lines.append(current_line)
@@ -153,42 +281,114 @@ class CardGenerator:
         Returns:
             输出文件路径
         """
-        # 创建画布
-        img = Image.new('RGB', (self.width, self.height), self._hex_to_rgb(self.background_color))
+        img = self._render(quote_text, title, subtitle, style)
+        
+        # 保存图片
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return self._save_card(img, output_path)
+    
+    def _render(
+        self,
+        quote_text: str,
+        title: str,
+        subtitle: str,
+        style: str
+    ) -> Image.Image:
+        """在画布上绘制卡片，返回的画布需通过 _save_card 归还"""
+        # 标题和装饰对同一风格的所有卡片都相同，复制缓存的模板后只绘制金句和副标题
+        if style not in ("minimal", "elegant", "modern"):
+            style = "minimal"
+        
+        template_key = (title, style)
+        if self._template_key != template_key:
+            self._template = self._build_template(title, style)
+            self._template_key = template_key
+        
+        img = self._acquire_canvas()
         draw = ImageDraw.Draw(img)
         
         # 根据风格生成不同的卡片
         if style == "minimal":
-            self._draw_minimal_card(draw, quote_text, title, subtitle)
+            self._draw_minimal_card(img, draw, quote_text, subtitle)
         elif style == "elegant":
-            self._draw_elegant_card(draw, quote_text, title, subtitle)
-        elif style == "modern":
-            self._draw_modern_card(draw, quote_text, title, subtitle)
+            self._draw_elegant_card(img, draw, quote_text, subtitle)
         else:
-            self._draw_minimal_card(draw, quote_text, title, subtitle)
+            self._draw_modern_card(img, draw, quote_text, subtitle)
         
-        # 保存图片
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        img.save(output_path, quality=95)
+        return img
+    
+    def _save_card(self, img: Image.Image, output_path: Path) -> str:
+        """保存卡片并归还画布"""
+        self._save_image(img, output_path)
+        self._release_canvas(img)
         
         console.print(f"✓ 卡片已生成: {output_path}", style="green")
         return str(output_path)
     
-    def _draw_minimal_card(
+    def _acquire_canvas(self) -> Image.Image:
+        """取出一块画布并铺上当前模板"""
+        try:
+            img = self._canvas_pool.get_nowait()
+        except queue.Empty:
+            return self._template.copy()
+        
+        img.paste(self._template)
+        return img
+    
+    def _release_canvas(self, img: Image.Image):
+        """归还画布，池已满时直接丢弃"""
+        try:
+            self._canvas_pool.put_nowait(img)
+        except queue.Full:
+            pass
+    
+    def _save_image(self, img: Image.Image, output_path: Path):
+        """按扩展名选择编码参数保存图片"""
+        suffix = output_path.suffix.lower()
+        
+        if suffix == ".png":
+            # PNG 的默认 zlib 压缩级别 (6) 是保存时的主要开销，级别 1 体积只略大
+            img.save(output_path, format="PNG", compress_level=1, optimize=False)
+        elif suffix in (".jpg", ".jpeg", ".webp"):
+            img.save(output_path, quality=95)
+        else:
+            img.save(output_path)
+    
+    def _build_template(self, title: str, style: str) -> Image.Image:
+        """
+        生成卡片模板（背景、装饰和标题）
+        
+        Args:
+            title: 标题
+            style: 卡片风格 (minimal, elegant, modern)
+        
+        Returns:
+            模板图像
+        """
+        # 创建画布
+        img = Image.new('RGB', (self.width, self.height), self._bg_rgb)
+        draw = ImageDraw.Draw(img)
+        
+        if style == "minimal":
+            self._draw_minimal_template(img, draw, title)
+        elif style == "elegant":
+            self._draw_elegant_template(img, draw, title)
+        else:
+            self._draw_modern_template(img, draw, title)
+        
+        return img
+    
+    def _draw_minimal_template(
         self,
+        img: Image.Image,
         draw: ImageDraw.ImageDraw,
-        quote_text: str,
-        title: str,
-        subtitle: str
+        title: str
     ):
-        """绘制极简风格卡片"""
+        """绘制极简风格模板"""
         # 绘制顶部装饰线
-        accent_rgb = self._hex_to_rgb(self.accent_color)
-        draw.rectangle(
-            [0, 0, self.width, 10],
-            fill=accent_rgb
-        )
+        accent_rgb = self._accent_rgb
+        self._fill_rect(img, (0, 0, self.width, 10), accent_rgb)
         
         # 绘制标题
         title_y = self.padding
@@ -196,7 +396,7 @@ class CardGenerator:
             (self.padding, title_y),
             title,
             font=self.title_font,
-            fill=self._hex_to_rgb(self.text_color)
+            fill=self._text_rgb
         )
         
         # 绘制引号
@@ -204,23 +404,32 @@ class CardGenerator:
         draw.text(
             (self.padding, quote_y),
             '"',
-            font=ImageFont.truetype(self.font.path, 120) if hasattr(self.font, 'path') else self.font,
+            font=self.quote_mark_font,
             fill=accent_rgb
         )
+    
+    def _draw_minimal_card(
+        self,
+        img: Image.Image,
+        draw: ImageDraw.ImageDraw,
+        quote_text: str,
+        subtitle: str
+    ):
+        """绘制极简风格卡片"""
+        accent_rgb = self._accent_rgb
         
-        # 绘制金句文本
-        text_y = quote_y + 100
+        # 绘制金句文本（位于模板中的引号下方）
+        text_y = self.padding + 120 + 100
         max_width = self.width - 2 * self.padding
         lines = self._wrap_text(quote_text, self.font, max_width)
         
-        for line in lines:
-            draw.text(
-                (self.padding, text_y),
-                line,
-                font=self.font,
-                fill=self._hex_to_rgb(self.text_color)
-            )
-            text_y += self.font.size * 1.5
+        draw.multiline_text(
+            (self.padding, text_y),
+            "\n".join(lines),
+            font=self.font,
+            fill=self._text_rgb,
+            spacing=self._line_spacing
+        )
         
         # 绘制副标题
         if subtitle:
@@ -232,25 +441,26 @@ class CardGenerator:
                 fill=accent_rgb
             )
     
-    def _draw_elegant_card(
+    def _draw_elegant_template(
         self,
+        img: Image.Image,
         draw: ImageDraw.ImageDraw,
-        quote_text: str,
-        title: str,
-        subtitle: str
+        title: str
     ):
-        """绘制优雅风格卡片"""
+        """绘制优雅风格模板"""
         # 绘制渐变背景效果（简化版）
-        accent_rgb = self._hex_to_rgb(self.accent_color)
+        accent_rgb = self._accent_rgb
         
-        # 绘制装饰边框
+        # 绘制装饰边框（与 draw.rectangle 的 outline 一致，向内绘制 border_width 像素）
         border_width = 3
-        draw.rectangle(
-            [self.padding - 20, self.padding - 20,
-             self.width - self.padding + 20, self.height - self.padding + 20],
-            outline=accent_rgb,
-            width=border_width
-        )
+        left = top = self.padding - 20
+        right = self.width - self.padding + 20
+        bottom = self.height - self.padding + 20
+        inset = border_width - 1
+        self._fill_rect(img, (left, top, right, top + inset), accent_rgb)
+        self._fill_rect(img, (left, bottom - inset, right, bottom), accent_rgb)
+        self._fill_rect(img, (left, top, left + inset, bottom), accent_rgb)
+        self._fill_rect(img, (right - inset, top, right, bottom), accent_rgb)
         
         # 绘制标题
         title_y = self.padding + 40
@@ -272,23 +482,31 @@ class CardGenerator:
             fill=accent_rgb,
             width=2
         )
+    
+    def _draw_elegant_card(
+        self,
+        img: Image.Image,
+        draw: ImageDraw.ImageDraw,
+        quote_text: str,
+        subtitle: str
+    ):
+        """绘制优雅风格卡片"""
+        accent_rgb = self._accent_rgb
         
-        # 绘制金句文本（居中）
-        text_y = line_y + 100
+        # 绘制金句文本（居中，位于模板中的分隔线下方）
+        text_y = self.padding + 40 + 80 + 100
         max_width = self.width - 2 * self.padding - 40
         lines = self._wrap_text(quote_text, self.font, max_width)
         
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=self.font)
-            line_width = bbox[2] - bbox[0]
-            line_x = (self.width - line_width) // 2
-            draw.text(
-                (line_x, text_y),
-                line,
-                font=self.font,
-                fill=self._hex_to_rgb(self.text_color)
-            )
-            text_y += self.font.size * 1.6
+        draw.multiline_text(
+            (self.width // 2, text_y),
+            "\n".join(lines),
+            font=self.font,
+            fill=self._text_rgb,
+            anchor="ma",
+            spacing=self._elegant_line_spacing,
+            align="center"
+        )
         
         # 绘制副标题（居中）
         if subtitle:
@@ -303,30 +521,21 @@ class CardGenerator:
                 fill=accent_rgb
             )
     
-    def _draw_modern_card(
+    def _draw_modern_template(
         self,
+        img: Image.Image,
         draw: ImageDraw.ImageDraw,
-        quote_text: str,
-        title: str,
-        subtitle: str
+        title: str
     ):
-        """绘制现代风格卡片"""
-        accent_rgb = self._hex_to_rgb(self.accent_color)
+        """绘制现代风格模板"""
+        accent_rgb = self._accent_rgb
         
         # 绘制左侧装饰条
-        draw.rectangle(
-            [0, 0, 20, self.height],
-            fill=accent_rgb
-        )
+        self._fill_rect(img, (0, 0, 20, self.height), accent_rgb)
         
-        # 绘制圆角矩形背景
+        # 绘制标题
         box_padding = 60
         box_left = self.padding + 20
-        box_top = self.padding + 100
-        box_right = self.width - self.padding
-        box_bottom = self.height - self.padding - 100
-        
-        # 绘制标题
         title_y = box_padding
         draw.text(
             (box_left, title_y),
@@ -334,32 +543,48 @@ class CardGenerator:
             font=self.title_font,
             fill=accent_rgb
         )
+    
+    def _draw_modern_card(
+        self,
+        img: Image.Image,
+        draw: ImageDraw.ImageDraw,
+        quote_text: str,
+        subtitle: str
+    ):
+        """绘制现代风格卡片"""
+        accent_rgb = self._accent_rgb
+        
+        # 内容区域
+        box_left = self.padding + 20
+        box_top = self.padding + 100
+        box_right = self.width - self.padding
+        box_bottom = self.height - self.padding - 100
         
         # 绘制金句文本
         text_y = box_top + 80
         max_width = box_right - box_left - 40
         lines = self._wrap_text(quote_text, self.font, max_width)
         
-        for line in lines:
-            draw.text(
-                (box_left + 20, text_y),
-                line,
-                font=self.font,
-                fill=self._hex_to_rgb(self.text_color)
-            )
-            text_y += self.font.size * 1.5
+        draw.multiline_text(
+            (box_left + 20, text_y),
+            "\n".join(lines),
+            font=self.font,
+            fill=self._text_rgb,
+            spacing=self._line_spacing
+        )
         
         # 绘制底部信息
         if subtitle:
-            draw.rectangle(
-                [box_left, box_bottom - 80, box_right, box_bottom],
-                fill=accent_rgb
+            self._fill_rect(
+                img,
+                (box_left, box_bottom - 80, box_right, box_bottom),
+                accent_rgb
             )
             draw.text(
                 (box_left + 20, box_bottom - 60),
                 subtitle,
                 font=self.small_font,
-                fill=self._hex_to_rgb(self.background_color)
+                fill=self._bg_rgb
             )
     
     def generate_batch(
@@ -367,7 +592,8 @@ class CardGenerator:
         quotes: list,
         output_dir: str,
         title: str = "播客金句",
-        style: str = "minimal"
+        style: str = "minimal",
+        workers: int = 1
     ) -> list:
         """
         批量生成金句卡片
@@ -377,6 +603,9 @@ class CardGenerator:
             output_dir: 输出目录
             title: 标题
             style: 卡片风格
+            workers: 渲染进程数，默认为 1，即在当前进程中顺序生成。大于 1 时使用进程池，
+                在 spawn/forkserver 启动方式下（macOS、Windows）调用方脚本需要用
+                if __name__ == "__main__": 保护入口
         
         Returns:
             生成的文件路径列表
@@ -384,7 +613,7 @@ class CardGenerator:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        output_paths = []
+        jobs = []
         
         for i, quote in enumerate(quotes, 1):
             # 处理不同的输入格式
@@ -398,18 +627,69 @@ class CardGenerator:
                 quote_text = str(quote)
                 subtitle = ''
             
-            output_path = output_dir / f"card_{i:03d}.png"
-            self.generate(
-                quote_text=quote_text,
-                title=title,
-                subtitle=subtitle,
-                output_path=str(output_path),
-                style=style
-            )
-            output_paths.append(str(output_path))
+            output_path = output_dir / f"card_{i:03d}.{self.output_format}"
+            jobs.append((quote_text, title, subtitle, str(output_path), style))
+        
+        workers = min(workers, len(jobs))
+        
+        output_paths = None
+        if workers > 1 and len(jobs) >= PARALLEL_MIN_CARDS:
+            # 每张卡片互相独立，多进程并行渲染；map 保证结果顺序与输入一致
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(self._init_kwargs,)
+                ) as executor:
+                    output_paths = list(executor.map(_render_one, jobs))
+            except BrokenProcessPool as e:
+                console.print(f"⚠ 渲染进程异常退出，改为顺序生成: {e}", style="yellow")
+        
+        if output_paths is None:
+            output_paths = self._generate_sequential(jobs)
         
         console.print(f"✓ 批量生成完成，共 {len(output_paths)} 张卡片", style="green")
         return output_paths
+    
+    def _generate_sequential(self, jobs: list) -> list:
+        """在当前进程中顺序渲染，后台线程编码保存上一张卡片的同时渲染下一张（Pillow 编码时会释放 GIL）"""
+        futures = []
+        with ThreadPoolExecutor(max_workers=SAVE_WORKERS) as executor:
+            for i, (quote_text, title, subtitle, output_path, style) in enumerate(jobs):
+                # 限制排队中的图片数量，避免保存跟不上时占用过多内存
+                if i >= SAVE_WORKERS:
+                    futures[i - SAVE_WORKERS].result()
+                
+                img = self._render(quote_text, title, subtitle, style)
+                futures.append(executor.submit(self._save_card, img, Path(output_path)))
+            
+            return [future.result() for future in futures]
+    
+    def _render_job(self, job: tuple) -> str:
+        """渲染 generate_batch 中的单个任务"""
+        quote_text, title, subtitle, output_path, style = job
+        return self.generate(
+            quote_text=quote_text,
+            title=title,
+            subtitle=subtitle,
+            output_path=output_path,
+            style=style
+        )
+
+
+# 子进程内复用的卡片生成器，由 _init_worker 在进程启动时创建
+_worker_generator: Optional[CardGenerator] = None
+
+
+def _init_worker(init_kwargs: dict):
+    """进程池初始化：每个子进程只加载一次字体"""
+    global _worker_generator
+    _worker_generator = CardGenerator(**init_kwargs)
+
+
+def _render_one(job: tuple) -> str:
+    """在子进程中渲染单张卡片"""
+    return _worker_generator._render_job(job)
 
 
 if __name__ == "__main__":
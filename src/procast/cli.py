@@ -2,6 +2,8 @@
 命令行界面工具
 """
 
+import os
+import sys
 import typer
 from pathlib import Path
 from typing import Optional
@@ -9,9 +11,6 @@ from rich.console import Console
 from rich.table import Table
 
 from procast.config import config
-from procast.transcriber import AudioTranscriber
-from procast.extractor import QuoteExtractor
-from procast.card_generator import CardGenerator
 
 app = typer.Typer(
     name="procast",
@@ -21,6 +20,49 @@ app = typer.Typer(
 console = Console()
 
 
+def _create_transcriber(model: str, language: str):
+    """根据配置创建音频转录器"""
+    from procast.transcriber import AudioTranscriber
+    
+    return AudioTranscriber(
+        model_name=model,
+        language=language,
+        backend=config.get("whisper.backend", "whisper"),
+        device=config.get("whisper.device"),
+        vad=config.get("whisper.vad", False)
+    )
+
+
+def _create_extractor():
+    """根据配置创建金句提取器"""
+    from procast.extractor import QuoteExtractor
+    
+    return QuoteExtractor(
+        api_key=config.get("llm.api_key"),
+        model=config.get("llm.model"),
+        base_url=config.get("llm.base_url"),
+        temperature=config.get("llm.temperature", 0.7),
+        cache_dir=config.get("llm.cache_dir")
+    )
+
+
+def _create_generator():
+    """根据配置创建卡片生成器"""
+    from procast.card_generator import CardGenerator
+    
+    return CardGenerator(
+        width=config.get("card.width", 1080),
+        height=config.get("card.height", 1920),
+        background_color=config.get("card.background_color", "#1a1a2e"),
+        text_color=config.get("card.text_color", "#ffffff"),
+        accent_color=config.get("card.accent_color", "#e94560"),
+        font_path=config.get("card.font_path"),
+        font_size=config.get("card.font_size", 48),
+        padding=config.get("card.padding", 100),
+        output_format=config.get("card.output_format", "png")
+    )
+
+
 @app.command()
 def transcribe(
     audio_path: str = typer.Argument(..., help="音频文件路径"),
@@ -32,7 +74,7 @@ def transcribe(
     console.print("[bold cyan]开始音频转录...[/bold cyan]")
     
     # 创建转录器
-    transcriber = AudioTranscriber(model_name=model, language=language)
+    transcriber = _create_transcriber(model, language)
     
     # 设置默认输出路径
     if output is None:
@@ -62,12 +104,7 @@ def extract(
     console.print("[bold cyan]开始提取金句...[/bold cyan]")
     
     # 创建提取器
-    extractor = QuoteExtractor(
-        api_key=config.get("llm.api_key"),
-        model=config.get("llm.model"),
-        base_url=config.get("llm.base_url"),
-        temperature=config.get("llm.temperature", 0.7)
-    )
+    extractor = _create_extractor()
     
     # 设置默认输出路径
     if output is None:
@@ -152,16 +189,7 @@ def generate(
     output_dir = Path(output_dir)
     
     # 创建卡片生成器
-    generator = CardGenerator(
-        width=config.get("card.width", 1080),
-        height=config.get("card.height", 1920),
-        background_color=config.get("card.background_color", "#1a1a2e"),
-        text_color=config.get("card.text_color", "#ffffff"),
-        accent_color=config.get("card.accent_color", "#e94560"),
-        font_path=config.get("card.font_path"),
-        font_size=config.get("card.font_size", 48),
-        padding=config.get("card.padding", 100)
-    )
+    generator = _create_generator()
     
     # 生成卡片
     try:
@@ -169,7 +197,8 @@ def generate(
             quotes,
             str(output_dir),
             title=title,
-            style=style
+            style=style,
+            workers=os.cpu_count() or 1
         )
         console.print(f"\n[bold green]✓ 成功生成 {len(output_paths)} 张卡片[/bold green]")
         console.print(f"输出目录: {output_dir}")
@@ -202,7 +231,7 @@ def pipeline(
     
     # 步骤 1: 转录音频
     console.print("[bold]步骤 1/3: 转录音频[/bold]")
-    transcriber = AudioTranscriber(model_name=whisper_model, language="zh")
+    transcriber = _create_transcriber(whisper_model, "zh")
     transcript_path = output_dir / "transcript.txt"
     
     try:
@@ -213,12 +242,7 @@ def pipeline(
     
     # 步骤 2: 提取金句
     console.print(f"\n[bold]步骤 2/3: 提取金句[/bold]")
-    extractor = QuoteExtractor(
-        api_key=config.get("llm.api_key"),
-        model=config.get("llm.model"),
-        base_url=config.get("llm.base_url"),
-        temperature=config.get("llm.temperature", 0.7)
-    )
+    extractor = _create_extractor()
     quotes_path = output_dir / "quotes.json"
     
     try:
@@ -241,16 +265,7 @@ def pipeline(
     
     # 步骤 3: 生成卡片
     console.print(f"\n[bold]步骤 3/3: 生成卡片[/bold]")
-    generator = CardGenerator(
-        width=config.get("card.width", 1080),
-        height=config.get("card.height", 1920),
-        background_color=config.get("card.background_color", "#1a1a2e"),
-        text_color=config.get("card.text_color", "#ffffff"),
-        accent_color=config.get("card.accent_color", "#e94560"),
-        font_path=config.get("card.font_path"),
-        font_size=config.get("card.font_size", 48),
-        padding=config.get("card.padding", 100)
-    )
+    generator = _create_generator()
     cards_dir = output_dir / "cards"
     
     try:
@@ -258,7 +273,8 @@ def pipeline(
             quotes,
             str(cards_dir),
             title="播客金句",
-            style=style
+            style=style,
+            workers=os.cpu_count() or 1
         )
     except Exception as e:
         console.print(f"[bold red]✗ 生成卡片失败: {e}[/bold red]")
@@ -272,6 +288,164 @@ def pipeline(
     console.print(f"- 卡片图片: {cards_dir}")
 
 
+class _ServeSession:
+    """serve 模式下的常驻会话，复用已加载的转录器、提取器和卡片生成器"""
+    
+    def __init__(self):
+        self._transcribers = {}
+        self._extractor = None
+        self._generator = None
+    
+    def _transcriber(self, model: str, language: str):
+        key = (model, language)
+        if key not in self._transcribers:
+            from procast import transcriber
+            transcriber.console.file = sys.stderr
+            self._transcribers[key] = _create_transcriber(model, language)
+        return self._transcribers[key]
+    
+    def _get_extractor(self):
+        if self._extractor is None:
+            from procast import extractor
+            extractor.console.file = sys.stderr
+            self._extractor = _create_extractor()
+        return self._extractor
+    
+    def _get_generator(self):
+        if self._generator is None:
+            from procast import card_generator
+            card_generator.console.file = sys.stderr
+            self._generator = _create_generator()
+        return self._generator
+    
+    def run(self, job: dict) -> dict:
+        """执行单个任务"""
+        command = job.get("command")
+        if command == "transcribe":
+            return self.transcribe(job)
+        if command == "extract":
+            return self.extract(job)
+        if command == "generate":
+            return self.generate(job)
+        if command == "pipeline":
+            return self.pipeline(job)
+        raise ValueError(f"未知命令: {command}")
+    
+    def transcribe(self, job: dict) -> dict:
+        audio_path = job["audio_path"]
+        output = job.get("output")
+        if output is None:
+            output_dir = Path(config.get("output.transcript_dir", "output/transcripts"))
+            output = str(output_dir / f"{Path(audio_path).stem}.txt")
+        
+        transcriber = self._transcriber(
+            job.get("model", config.get("whisper.model", "base")),
+            job.get("language", config.get("whisper.language", "zh"))
+        )
+        transcriber.transcribe(audio_path, output)
+        return {"output": output}
+    
+    def extract(self, job: dict) -> dict:
+        text_path = job["text_path"]
+        output = job.get("output")
+        if output is None:
+            output_dir = Path(config.get("output.quotes_dir", "output/quotes"))
+            output = str(output_dir / f"{Path(text_path).stem}_quotes.json")
+        
+        extractor = self._get_extractor()
+        quotes = extractor.extract_from_file(text_path, output, num_quotes=job.get("num", 10))
+        quotes = extractor.filter_quotes(quotes, min_score=job.get("min_score", 0.0))
+        return {"output": output, "quotes": [q.to_dict() for q in quotes]}
+    
+    def generate(self, job: dict) -> dict:
+        import json
+        from procast.extractor import Quote
+        
+        quotes = job.get("quotes")
+        if quotes is None:
+            with open(job["quotes_path"], 'r', encoding='utf-8') as f:
+                quotes = json.load(f)
+        quotes = [Quote.from_dict(q) for q in quotes]
+        
+        min_score = job.get("min_score", 0.0)
+        max_count = job.get("max_count", 0)
+        if min_score > 0 or max_count > 0:
+            quotes = self._get_extractor().filter_quotes(
+                quotes,
+                min_score=min_score,
+                max_count=max_count if max_count > 0 else None
+            )
+        
+        output_dir = job.get("output_dir") or config.get("output.cards_dir", "output/cards")
+        output_paths = self._get_generator().generate_batch(
+            quotes,
+            str(output_dir),
+            title=job.get("title", "播客金句"),
+            style=job.get("style", "minimal"),
+            # 渲染子进程会重新创建输出到标准输出的 console，保持单进程以免污染 JSON 结果
+            workers=1
+        )
+        return {"output_dir": str(output_dir), "cards": output_paths}
+    
+    def pipeline(self, job: dict) -> dict:
+        audio_path = Path(job["audio_path"])
+        output_dir = Path(job.get("output_dir") or Path("output") / audio_path.stem)
+        transcript_path = output_dir / "transcript.txt"
+        quotes_path = output_dir / "quotes.json"
+        
+        self.transcribe({
+            "audio_path": str(audio_path),
+            "output": str(transcript_path),
+            "model": job.get("whisper_model", config.get("whisper.model", "base")),
+            "language": "zh"
+        })
+        extracted = self.extract({
+            "text_path": str(transcript_path),
+            "output": str(quotes_path),
+            "num": job.get("num", 10),
+            "min_score": job.get("min_score", 7.0)
+        })
+        generated = self.generate({
+            "quotes": extracted["quotes"],
+            "output_dir": str(output_dir / "cards"),
+            "style": job.get("style", "minimal")
+        })
+        
+        return {
+            "transcript": str(transcript_path),
+            "quotes": str(quotes_path),
+            "cards": generated["cards"]
+        }
+
+
+@app.command()
+def serve():
+    """常驻模式：从标准输入逐行读取 JSON 任务，模型和字体只加载一次"""
+    import json
+    
+    # 标准输出只用于返回 JSON 结果，进度信息改为输出到标准错误
+    console.file = sys.stderr
+    console.print("[bold cyan]ProCast serve 已启动，等待任务...[/bold cyan]")
+    
+    session = _ServeSession()
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        job_id = None
+        try:
+            job = json.loads(line)
+            job_id = job.get("id")
+            reply = {"id": job_id, "ok": True, "result": session.run(job)}
+        except Exception as e:
+            reply = {"id": job_id, "ok": False, "error": str(e)}
+        
+        sys.stdout.write(json.dumps(reply, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
 @app.command()
 def config_show():
     """显示当前配置"""
@@ -2,16 +2,24 @@
 配置管理模块
 """
 
-import json
+import functools
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from dotenv import load_dotenv
 
+from . import _jsonio
+
 # 加载环境变量
 load_dotenv()
 
 
+@functools.lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """拆分点号分隔的配置键（按键缓存，get() 每次只需逐层查字典）"""
+    return tuple(key.split("."))
+
+
 class Config:
     """配置管理类"""
     
@@ -26,14 +34,20 @@ class Config:
             config_path = os.getenv("CONFIG_PATH", "config.json")
         
         self.config_path = Path(config_path)
-        self.config = self._load_config()
-        self._override_with_env()
+        self._config = None
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """配置字典，首次访问时才读取配置文件和环境变量"""
+        if self._config is None:
+            self._config = self._load_config()
+            self._override_with_env()
+        return self._config
     
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
         if self.config_path.exists():
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return _jsonio.loads(self.config_path.read_bytes())
         else:
             # 返回默认配置
             return self._default_config()
@@ -47,11 +61,15 @@ class Config:
                 "api_key": "",
                 "base_url": "https://api.openai.com/v1",
                 "temperature": 0.7,
-                "max_tokens": 2000
+                "max_tokens": 2000,
+                "cache_dir": "~/.procast/cache"
             },
             "whisper": {
                 "model": "base",
-                "language": "zh"
+                "language": "zh",
+                "backend": "whisper",
+                "device": None,
+                "vad": False
             },
             "card": {
                 "width": 1080,
@@ -61,7 +79,8 @@ class Config:
                 "accent_color": "#e94560",
                 "font_path": None,
                 "font_size": 48,
-                "padding": 100
+                "padding": 100,
+                "output_format": "png"
             },
             "output": {
                 "transcript_dir": "output/transcripts",
@@ -93,10 +112,10 @@ class Config:
         Returns:
             配置值
         """
-        keys = key.split(".")
+        # 只缓存键的拆分结果，不缓存值：调用方可能直接修改 config 或 get() 返回的字典
         value = self.config
         
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
@@ -125,8 +144,7 @@ class Config:
     def save(self):
         """保存配置到文件"""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
+        _jsonio.write(self.config_path, self.config)
 
 
 # 全局配置实例
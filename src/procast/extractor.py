@@ -3,19 +3,68 @@
 使用 LLM 从文本中提取有价值的金句
 """
 
+import asyncio
+import functools
+import hashlib
+import heapq
+import importlib.util
 import json
-from typing import List, Dict, Optional
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from . import _jsonio
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 console = Console()
 
+# 长文本分段提取：每段的字符数及相邻分段的重叠字符数
+CHUNK_SIZE = 4000
+CHUNK_OVERLAP = 200
+
+# 进程内 LLM 响应缓存的最大条目数（磁盘缓存不限）
+MEMORY_CACHE_SIZE = 128
+
+# LLM 的系统提示词
+SYSTEM_PROMPT = "你是一个专业的内容编辑，擅长从播客或文章中提取有价值的金句。"
+
+# 分段并发请求的最大数量
+MAX_CONCURRENCY = 8
+
+# 请求失败（如限流）时的最大重试次数，由 openai 客户端按 retry-after 指数退避
+MAX_RETRIES = 5
+
+# HTTP 连接池大小；超时与 openai 客户端默认值一致
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# 合并分段结果时，字符三元组 Jaccard 相似度达到该值的金句视为重复
+DEDUP_THRESHOLD = 0.85
+
+# 去重时忽略的空白和标点
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
 
 class Quote:
     """金句数据类"""
     
+    # 不为每个实例创建 __dict__，减少大量金句时的内存占用并加快属性访问
+    __slots__ = ("text", "context", "category", "score", "timestamp")
+    
     def __init__(
         self,
         text: str,
@@ -52,6 +101,55 @@ class Quote:
         )
 
 
+# 提示词中文本之前的固定部分
+_PROMPT_HEAD = """请从以下文本中提取最有价值的金句。
+
+文本内容：
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def _prompt_tail(num_quotes: int, min_length: int, max_length: int, categories: Tuple[str, ...]) -> str:
+    """提示词中文本之后的部分，同一组参数只构建一次（分段提取时各段共用）"""
+    return f"""
+
+要求：
+1. 提取约 {num_quotes} 条最有价值的金句
+2. 每条金句长度在 {min_length}-{max_length} 字之间
+3. 金句应该具有启发性、观点性或实用性
+4. 为每条金句分配一个分类：{', '.join(categories)}
+5. 为每条金句打分（0-10分），分数越高表示越有价值
+6. 提供简短的上下文说明（可选）
+
+请以 JSON 格式返回结果，格式如下：
+{{
+  "quotes": [
+    {{
+      "text": "金句内容",
+      "context": "上下文说明",
+      "category": "分类",
+      "score": 8.5
+    }}
+  ]
+}}
+"""
+
+
+def _http_client_options() -> Dict:
+    """httpx 客户端参数：安装了 h2 时启用 HTTP/2，使并发请求复用同一连接"""
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "limits": HTTP_LIMITS,
+        "timeout": HTTP_TIMEOUT
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """进程内共享的 HTTP 客户端，多个 QuoteExtractor 复用已建立的连接，避免重复 TLS 握手"""
+    return httpx.Client(**_http_client_options())
+
+
 class QuoteExtractor:
     """金句提取器"""
     
@@ -60,7 +158,9 @@ class QuoteExtractor:
         api_key: str,
         model: str = "gpt-4-turbo-preview",
         base_url: str = "https://api.openai.com/v1",
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        cache_dir: Optional[str] = None,
+        quiet: bool = False
     ):
         """
         初始化金句提取器
@@ -70,10 +170,25 @@ class QuoteExtractor:
             model: 模型名称
             base_url: API 基础 URL
             temperature: 温度参数
+            cache_dir: LLM 响应缓存目录，为 None 时不缓存
+            quiet: 是否隐藏等待 LLM 响应时的状态动画（批量处理时使用）
         """
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=MAX_RETRIES,
+            http_client=_shared_http_client()
+        )
+        self.api_key = api_key
+        self.base_url = base_url
         self.model = model
         self.temperature = temperature
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.quiet = quiet
+        
+        # 进程内 LRU 缓存：{缓存键: 响应内容}，最多保留 MEMORY_CACHE_SIZE 条
+        self._memory_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
     
     def extract(
         self,
@@ -81,64 +196,293 @@ class QuoteExtractor:
         num_quotes: int = 10,
         min_length: int = 10,
         max_length: int = 200,
-        categories: Optional[List[str]] = None
+        categories: Optional[List[str]] = None,
+        chunk_size: int = CHUNK_SIZE
     ) -> List[Quote]:
         """
         从文本中提取金句
         
+        超过 chunk_size 的长文本会被切分为相互重叠的分段并发提取，再合并去重。
+        
         Args:
             text: 输入文本
             num_quotes: 期望提取的金句数量
             min_length: 金句最小长度
             max_length: 金句最大长度
             categories: 金句分类列表
+            chunk_size: 每个分段的最大字符数
         
         Returns:
             金句列表
         """
+        chunks = _split_text(text, chunk_size, CHUNK_OVERLAP)
+        return self._extract_chunks(chunks, num_quotes, min_length, max_length, categories)
+    
+    def iter_extract(
+        self,
+        text: str,
+        num_quotes: int = 10,
+        min_length: int = 10,
+        max_length: int = 200,
+        categories: Optional[List[str]] = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[Quote]:
+        """
+        流式提取金句，LLM 每生成完一条金句就立即返回，参数同 extract
+        
+        超过 chunk_size 的长文本需要合并各分段结果后去重，此时等全部分段完成后再逐条返回。
+        
+        Yields:
+            金句
+        """
+        chunks = _split_text(text, chunk_size, CHUNK_OVERLAP)
+        if len(chunks) > 1:
+            yield from self._extract_chunks(chunks, num_quotes, min_length, max_length, categories)
+            return
+        
         if not categories:
             categories = ["启发", "观点", "方法论", "故事", "其他"]
         
         prompt = self._build_prompt(text, num_quotes, min_length, max_length, categories)
+        key, quotes = self._lookup(prompt)
+        if quotes is not None:
+            console.print("✓ 命中缓存，跳过 LLM 请求", style="dim")
+            yield from quotes
+            return
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            progress.add_task(description="正在提取金句...", total=None)
+        stream = self.client.chat.completions.create(**self._request_params(prompt), stream=True)
+        pieces = []
+        finish_reason = None
+        
+        def deltas() -> Iterator[str]:
+            nonlocal finish_reason
+            for event in stream:
+                if not event.choices:
+                    continue
+                choice = event.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                if choice.delta.content:
+                    pieces.append(choice.delta.content)
+                    yield pieces[-1]
+        
+        events = deltas()
+        for item in _iter_stream_items(events, "quotes"):
+            yield _quote_from_item(item)
+        
+        # 接收数组之后的剩余内容，完整且能解析的响应才写入缓存
+        for _ in events:
+            pass
+        try:
+            self._accept(key, "".join(pieces), finish_reason)
+        except ValueError:
+            pass
+    
+    def _extract_chunks(
+        self,
+        chunks: List[str],
+        num_quotes: int = 10,
+        min_length: int = 10,
+        max_length: int = 200,
+        categories: Optional[List[str]] = None
+    ) -> List[Quote]:
+        """从已切分好的文本分段中提取金句"""
+        if not categories:
+            categories = ["启发", "观点", "方法论", "故事", "其他"]
+        
+        if len(chunks) == 1:
+            prompt = self._build_prompt(chunks[0], num_quotes, min_length, max_length, categories)
+            quotes = self._complete(prompt)
+        else:
+            # 按分段数平摊金句数量，合并后按分数保留前 num_quotes 条
+            per_chunk = math.ceil(num_quotes / len(chunks))
+            prompts = [
+                self._build_prompt(chunk, per_chunk, min_length, max_length, categories)
+                for chunk in chunks
+            ]
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一个专业的内容编辑，擅长从播客或文章中提取有价值的金句。"
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=self.temperature,
-                response_format={"type": "json_object"}
-            )
-        
-        result = json.loads(response.choices[0].message.content)
-        quotes = []
-        
-        for item in result.get("quotes", []):
-            quote = Quote(
-                text=item.get("text", ""),
-                context=item.get("context", ""),
-                category=item.get("category", ""),
-                score=item.get("score", 0.0)
-            )
-            quotes.append(quote)
+            with self._status(f"正在提取金句（共 {len(chunks)} 段）..."):
+                results = self._complete_concurrently(prompts)
+            
+            quotes = _merge_quotes(
+                [quote for chunk_quotes in results for quote in chunk_quotes]
+            )[:num_quotes]
         
         console.print(f"✓ 成功提取 {len(quotes)} 条金句", style="green")
         return quotes
     
+    def _status(self, message: str):
+        """等待期间显示的状态动画，quiet 时不显示"""
+        return nullcontext() if self.quiet else console.status(message, spinner="dots")
+    
+    def _parse_quotes(self, content: str) -> List[Quote]:
+        """解析 LLM 返回的 JSON"""
+        result = _jsonio.loads(content)
+        if not isinstance(result, dict):
+            raise ValueError("LLM 返回的 JSON 不是对象")
+        return [_quote_from_item(item) for item in result.get("quotes", [])]
+    
+    def _complete(self, prompt: str, verbose: bool = True) -> List[Quote]:
+        """
+        调用 LLM 并返回解析后的金句
+        
+        相同服务地址、模型、温度和提示词的请求直接返回缓存结果，不再访问 API。
+        """
+        key, quotes = self._lookup(prompt)
+        if quotes is not None:
+            if verbose:
+                console.print("✓ 命中缓存，跳过 LLM 请求", style="dim")
+            return quotes
+        
+        with self._status("正在提取金句...") if verbose else nullcontext():
+            response = self.client.chat.completions.create(**self._request_params(prompt))
+        
+        choice = response.choices[0]
+        return self._accept(key, choice.message.content, choice.finish_reason)
+    
+    def _complete_concurrently(self, prompts: List[str]) -> List[List[Quote]]:
+        """
+        并发请求多个提示词，返回各提示词解析后的金句，顺序与输入一致
+        
+        在已有事件循环的环境中（如 Jupyter、异步服务）无法调用 asyncio.run，
+        改用线程池并发调用同步客户端。
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._complete_many(prompts))
+        
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+            return list(executor.map(lambda prompt: self._complete(prompt, verbose=False), prompts))
+    
+    async def _complete_many(self, prompts: List[str]) -> List[List[Quote]]:
+        """使用异步客户端并发请求多个提示词，返回顺序与输入一致"""
+        # 异步客户端绑定当前事件循环，每次运行单独创建，close() 时一并关闭
+        client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=MAX_RETRIES,
+            http_client=httpx.AsyncClient(**_http_client_options())
+        )
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        
+        async def complete(prompt: str) -> List[Quote]:
+            key, quotes = self._lookup(prompt)
+            if quotes is not None:
+                return quotes
+            
+            async with semaphore:
+                response = await client.chat.completions.create(**self._request_params(prompt))
+            
+            choice = response.choices[0]
+            return self._accept(key, choice.message.content, choice.finish_reason)
+        
+        try:
+            return await asyncio.gather(*(complete(prompt) for prompt in prompts))
+        finally:
+            await client.close()
+    
+    def _lookup(self, prompt: str) -> Tuple[str, Optional[List[Quote]]]:
+        """
+        查找提示词对应的缓存结果
+        
+        Returns:
+            (缓存键, 解析后的金句)，未命中或缓存内容无法解析时金句为 None
+        """
+        key = self._cache_key(prompt)
+        content = self._cached(key)
+        if content is not None:
+            try:
+                return key, self._parse_quotes(content)
+            except ValueError:
+                # 损坏的缓存条目视为未命中，重新请求后覆盖
+                pass
+        return key, None
+    
+    def _accept(self, key: str, content: str, finish_reason: Optional[str]) -> List[Quote]:
+        """
+        解析 LLM 响应，只有完整生成（finish_reason 为 stop）且能解析的响应才写入缓存
+        
+        响应不是合法的 JSON 对象时抛出 ValueError，不写入缓存。
+        """
+        quotes = self._parse_quotes(content)
+        if finish_reason == "stop":
+            self._store(key, content)
+        return quotes
+    
+    def _request_params(self, prompt: str) -> Dict:
+        """构建 chat.completions.create 的请求参数"""
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": self.temperature,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _cached(self, key: str) -> Optional[str]:
+        """查找进程内缓存和磁盘缓存，未命中时返回 None"""
+        with self._memory_cache_lock:
+            content = self._memory_cache.get(key)
+            if content is not None:
+                self._memory_cache.move_to_end(key)
+                return content
+        
+        content = self._read_cache(key)
+        if content is not None:
+            self._remember(key, content)
+        return content
+    
+    def _store(self, key: str, content: str):
+        """写入进程内缓存和磁盘缓存"""
+        self._remember(key, content)
+        self._write_cache(key, content)
+    
+    def _remember(self, key: str, content: str):
+        """写入进程内缓存，超出容量时淘汰最久未使用的条目"""
+        with self._memory_cache_lock:
+            self._memory_cache[key] = content
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
+    def _cache_key(self, prompt: str) -> str:
+        """根据服务地址、模型、温度、系统提示词和提示词计算缓存键"""
+        raw = f"{self.base_url}|{self.model}|{self.temperature}|{SYSTEM_PROMPT}|{prompt}".encode("utf-8")
+        if blake3:
+            return blake3.blake3(raw, max_threads=blake3.blake3.AUTO).hexdigest()
+        return hashlib.blake2b(raw, digest_size=32).hexdigest()
+    
+    def _read_cache(self, key: str) -> Optional[str]:
+        """读取磁盘缓存，不存在时返回 None"""
+        if self.cache_dir is None:
+            return None
+        
+        cache_path = self.cache_dir / f"{key}.json"
+        if not cache_path.exists():
+            return None
+        
+        return cache_path.read_text(encoding="utf-8")
+    
+    def _write_cache(self, key: str, content: str):
+        """写入磁盘缓存（先写临时文件再替换，避免中断时留下半个文件）"""
+        if self.cache_dir is None:
+            return
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path = self.cache_dir / f"{key}.json"
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    
     def _build_prompt(
         self,
         text: str,
@@ -147,32 +491,8 @@ class QuoteExtractor:
         max_length: int,
         categories: List[str]
     ) -> str:
-        """构建提示词"""
-        return f"""请从以下文本中提取最有价值的金句。
-
-文本内容：
-{text}
-
-要求：
-1. 提取约 {num_quotes} 条最有价值的金句
-2. 每条金句长度在 {min_length}-{max_length} 字之间
-3. 金句应该具有启发性、观点性或实用性
-4. 为每条金句分配一个分类：{', '.join(categories)}
-5. 为每条金句打分（0-10分），分数越高表示越有价值
-6. 提供简短的上下文说明（可选）
-
-请以 JSON 格式返回结果，格式如下：
-{{
-  "quotes": [
-    {{
-      "text": "金句内容",
-      "context": "上下文说明",
-      "category": "分类",
-      "score": 8.5
-    }}
-  ]
-}}
-"""
+        """构建提示词：固定的头部 + 文本 + 按参数缓存的尾部"""
+        return _PROMPT_HEAD + text + _prompt_tail(num_quotes, min_length, max_length, tuple(categories))
     
     def extract_from_file(
         self,
@@ -197,8 +517,7 @@ class QuoteExtractor:
             raise FileNotFoundError(f"文件不存在: {input_path}")
         
         # 读取文本
-        with open(input_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        text = input_path.read_text(encoding='utf-8')
         
         # 提取金句
         quotes = self.extract(text, **kwargs)
@@ -208,9 +527,8 @@ class QuoteExtractor:
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            quotes_data = [q.to_dict() for q in quotes]
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(quotes_data, f, ensure_ascii=False, indent=2)
+            # Quote 由 default 直接转换，无需先构建字典列表
+            _jsonio.write(output_path, quotes, default=Quote.to_dict)
             
             console.print(f"✓ 金句已保存到: {output_path}", style="green")
         
@@ -235,23 +553,128 @@ class QuoteExtractor:
         Returns:
             过滤后的金句列表
         """
-        filtered = quotes
+        # 一次遍历同时按分数和分类过滤
+        filtered = [
+            q for q in quotes
+            if (min_score <= 0 or q.score >= min_score)
+            and (not category or q.category == category)
+        ]
         
-        # 按分数过滤
-        if min_score > 0:
-            filtered = [q for q in filtered if q.score >= min_score]
+        # 排序并限制数量；只取前 max_count 条时用堆选择，O(N log k) 代替整体排序
+        if max_count and max_count < len(filtered):
+            return heapq.nlargest(max_count, filtered, key=attrgetter("score"))
         
-        # 按分类过滤
-        if category:
-            filtered = [q for q in filtered if q.category == category]
+        filtered.sort(key=attrgetter("score"), reverse=True)
+        return filtered
+
+
+def _quote_from_item(item: Dict) -> Quote:
+    """将 LLM 返回的单条金句转换为 Quote"""
+    return Quote(
+        text=item.get("text", ""),
+        context=item.get("context", ""),
+        category=item.get("category", ""),
+        score=item.get("score", 0.0)
+    )
+
+
+def _iter_stream_items(pieces: Iterable[str], key: str) -> Iterator[Dict]:
+    """
+    从流式到达的 JSON 文本片段中逐个解析 {key: [...]} 数组里的元素
+    
+    每个元素完整到达后立即返回，无需等待整个 JSON 接收完毕。
+    """
+    decoder = json.JSONDecoder()
+    array_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ""
+    pos = None
+    
+    for piece in pieces:
+        buffer += piece
         
-        # 排序并限制数量
-        filtered.sort(key=lambda q: q.score, reverse=True)
+        if pos is None:
+            match = array_re.search(buffer)
+            if match is None:
+                continue
+            pos = match.end()
         
-        if max_count:
-            filtered = filtered[:max_count]
+        while True:
+            # 跳过元素之间的空白和逗号
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer) or buffer[pos] == "]":
+                break
+            
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 元素尚未接收完整，等待下一个片段
+                break
+            yield item
         
-        return filtered
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+
+
+def _split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """将文本切分为相互重叠的分段，重叠部分最多为分段长度的一半，保证每次都向前推进"""
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size 必须为正数: {chunk_size}")
+    if len(text) <= chunk_size:
+        return [text]
+    
+    overlap = min(overlap, chunk_size // 2)
+    chunks = []
+    start = 0
+    while True:
+        chunks.append(text[start:start + chunk_size])
+        if start + chunk_size >= len(text):
+            break
+        start += chunk_size - overlap
+    
+    return chunks
+
+
+def _merge_quotes(quotes: List[Quote], threshold: float = DEDUP_THRESHOLD) -> List[Quote]:
+    """
+    合并各分段的金句：近似重复的金句只保留分数最高的一条，按分数降序返回
+    
+    相似度为忽略空白和标点后字符三元组集合的 Jaccard 系数。通过三元组倒排索引
+    只与共享三元组的已保留金句比较，避免两两比较所有金句。
+    """
+    kept: List[Quote] = []
+    kept_shingles: List[set] = []
+    # 三元组 -> 包含它的已保留金句下标
+    index: Dict[str, List[int]] = {}
+    
+    # 按分数从高到低处理，先保留的一定是同组重复金句中分数最高的
+    for quote in sorted(quotes, key=attrgetter("score"), reverse=True):
+        shingles = _shingles(_NON_WORD_RE.sub("", quote.text).lower())
+        
+        overlaps: Dict[int, int] = {}
+        for shingle in shingles:
+            for i in index.get(shingle, ()):
+                overlaps[i] = overlaps.get(i, 0) + 1
+        
+        if any(
+            common / (len(shingles) + len(kept_shingles[i]) - common) >= threshold
+            for i, common in overlaps.items()
+        ):
+            continue
+        
+        for shingle in shingles:
+            index.setdefault(shingle, []).append(len(kept))
+        kept.append(quote)
+        kept_shingles.append(shingles)
+    
+    return kept
+
+
+def _shingles(text: str) -> set:
+    """字符三元组集合，不足三个字符时以整段文本作为唯一元素"""
+    if len(text) < 3:
+        return {text}
+    return {text[i:i + 3] for i in range(len(text) - 2)}
 
 
 if __name__ == "__main__":
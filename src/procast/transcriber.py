@@ -3,51 +3,212 @@
 使用 OpenAI Whisper 进行音频转录
 """
 
+import bisect
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, Dict
-import whisper
+from typing import Optional, Dict, List, Tuple
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from . import _jsonio
 
 console = Console()
 
+# 支持的转录后端
+BACKENDS = ("whisper", "faster-whisper")
+
+# Whisper 输入音频的采样率
+SAMPLE_RATE = 16000
+
+# 在推理设备上计算 mel 频谱的最长音频时长（秒）：30 分钟音频整段 STFT 约占用 0.5 GB 显存
+GPU_MEL_MAX_SECONDS = 30 * 60
+
+# 分段中需要保留的字段
+_SEGMENT_FIELDS = itemgetter('start', 'end', 'text')
+
+
+def _device_type(device: str) -> str:
+    """设备类型，去掉设备编号，如 cuda:1 -> cuda"""
+    return device.partition(":")[0]
+
+
+def _resolve_device(backend: str, device: Optional[str]) -> str:
+    """确定推理设备：未指定时依次选择 CUDA、MPS (Apple Silicon)、CPU"""
+    if backend == "faster-whisper":
+        # CTranslate2 只支持 CUDA 和 CPU
+        import ctranslate2
+        
+        if device is None:
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        return device if _device_type(device) == "cuda" else "cpu"
+    
+    if device is not None:
+        return device
+    
+    import torch
+    
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@functools.lru_cache(maxsize=2)
+def _cached_load(model_name: str, backend: str, device: str):
+    """
+    加载 Whisper 模型（进程内按模型名、后端和设备缓存）
+    
+    多个 AudioTranscriber 共享同一份模型，批量处理时不会重复从磁盘加载。
+    """
+    if backend == "faster-whisper":
+        # CTranslate2 后端：GPU 上使用 FP16，CPU 上使用 INT8 量化
+        from faster_whisper import WhisperModel
+        
+        # CTranslate2 分别接收设备类型和编号（"cuda:1" -> device="cuda", device_index=1）
+        device_type, _, index = device.partition(":")
+        compute_type = "float16" if device_type == "cuda" else "int8"
+        return WhisperModel(
+            model_name,
+            device=device_type,
+            device_index=int(index) if index else 0,
+            compute_type=compute_type
+        )
+    
+    import whisper
+    return whisper.load_model(model_name, device=device)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_vad():
+    """加载 Silero VAD 模型（silero-vad 包自带模型权重），返回 (模型, get_speech_timestamps)"""
+    from silero_vad import get_speech_timestamps, load_silero_vad
+    
+    return load_silero_vad(), get_speech_timestamps
+
+
+def _strip_silence(audio):
+    """
+    去除音频中的非语音部分
+    
+    Returns:
+        (只含语音的音频, 偏移表)，偏移表为 [(拼接后起点秒数, 原始起点秒数), ...]；
+        未检测到语音时原样返回音频，偏移表为 None
+    """
+    import torch
+    
+    model, get_speech_timestamps = _cached_vad()
+    ranges = get_speech_timestamps(audio, model, sampling_rate=SAMPLE_RATE)
+    if not ranges:
+        return audio, None
+    
+    offsets = []
+    position = 0
+    for r in ranges:
+        offsets.append((position / SAMPLE_RATE, r['start'] / SAMPLE_RATE))
+        position += r['end'] - r['start']
+    
+    speech = torch.cat([audio[r['start']:r['end']] for r in ranges])
+    return speech, offsets
+
+
+def _remap_timestamps(result: Dict[str, any], offsets: List[Tuple[float, float]]):
+    """将基于拼接后语音的分段时间戳映射回原始音频的时间"""
+    starts = [concat_start for concat_start, _ in offsets]
+    
+    def remap(t: float, is_end: bool) -> float:
+        # 恰好落在两段语音拼接处的结束时间归属前一段
+        i = (bisect.bisect_left(starts, t) if is_end else bisect.bisect_right(starts, t)) - 1
+        concat_start, orig_start = offsets[max(i, 0)]
+        return orig_start + (t - concat_start)
+    
+    for segment in result.get('segments', []):
+        segment['start'] = remap(segment['start'], False)
+        segment['end'] = remap(segment['end'], True)
+
+
+def _slim(result: Dict[str, any]) -> Dict[str, any]:
+    """精简转录结果，只保留文本、语言和分段的起止时间与文本"""
+    return {
+        'text': result['text'],
+        'language': result.get('language'),
+        'segments': _slim_segments(result)
+    }
+
+
+def _slim_segments(result: Dict[str, any]) -> List[Dict[str, any]]:
+    """提取各分段的起止时间和去除首尾空白的文本"""
+    return [
+        {'start': start, 'end': end, 'text': text.strip()}
+        for start, end, text in map(_SEGMENT_FIELDS, result.get('segments', ()))
+    ]
+
 
 class AudioTranscriber:
     """音频转文字处理类"""
     
-    def __init__(self, model_name: str = "base", language: str = "zh"):
+    def __init__(
+        self,
+        model_name: str = "base",
+        language: str = "zh",
+        backend: str = "whisper",
+        device: Optional[str] = None,
+        quiet: bool = False,
+        vad: bool = False
+    ):
         """
         初始化转录器
         
         Args:
             model_name: Whisper 模型名称 (tiny, base, small, medium, large)
             language: 语言代码，默认中文
+            backend: 转录后端，whisper (openai-whisper) 或 faster-whisper (CTranslate2)
+            device: 推理设备 (cuda, mps, cpu)，默认自动选择
+            quiet: 是否隐藏加载模型时的状态动画（批量处理时使用）
+            vad: 是否先用 Silero VAD 去除静音再转录（仅 whisper 后端，
+                faster-whisper 后端始终启用自带的 VAD）
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"不支持的转录后端: {backend}，可选: {', '.join(BACKENDS)}")
+        
         self.model_name = model_name
         self.language = language
+        self.backend = backend
+        self.device = device
+        self.quiet = quiet
+        self.vad = vad
         self.model = None
         
     def _load_model(self):
         """加载 Whisper 模型"""
         if self.model is None:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                progress.add_task(
-                    description=f"正在加载 Whisper {self.model_name} 模型...",
-                    total=None
-                )
-                self.model = whisper.load_model(self.model_name)
+            self.device = _resolve_device(self.backend, self.device)
+            
+            status = (
+                nullcontext() if self.quiet
+                else console.status(f"正在加载 Whisper {self.model_name} 模型 ({self.device})...", spinner="dots")
+            )
+            with status:
+                try:
+                    self.model = _cached_load(self.model_name, self.backend, self.device)
+                except (NotImplementedError, RuntimeError) as e:
+                    if _device_type(self.device) != "mps":
+                        raise
+                    # 部分 openai-whisper 版本的模型无法迁移到 MPS，回退到 CPU
+                    console.print(f"⚠ 无法在 MPS 上加载模型，改用 CPU: {e}", style="yellow")
+                    self.device = "cpu"
+                    self.model = _cached_load(self.model_name, self.backend, self.device)
             console.print(f"✓ 模型加载完成", style="green")
     
     def transcribe(
         self,
         audio_path: str,
         output_path: Optional[str] = None,
-        verbose: bool = True
+        verbose: bool = True,
+        save_full: bool = False
     ) -> Dict[str, any]:
         """
         转录音频文件
@@ -56,6 +217,7 @@ class AudioTranscriber:
             audio_path: 音频文件路径
             output_path: 输出文件路径，如果为 None 则不保存
             verbose: 是否显示详细信息
+            save_full: JSON 中是否保留完整结果（token、概率等调试信息）
         
         Returns:
             包含转录结果的字典
@@ -72,33 +234,183 @@ class AudioTranscriber:
         if verbose:
             console.print(f"正在转录: {audio_path.name}", style="cyan")
         
-        result = self.model.transcribe(
-            str(audio_path),
-            language=self.language,
-            verbose=False
-        )
+        result = self._transcribe_audio(self._load_audio(audio_path))
         
         # 保存结果
         if output_path:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 保存纯文本
-            text_path = output_path.with_suffix('.txt')
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(result['text'])
-            
-            # 保存详细结果（包含时间戳）
-            import json
-            json_path = output_path.with_suffix('.json')
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            self._save_result(result, output_path, verbose, save_full)
+        
+        return result
+    
+    def transcribe_many(
+        self,
+        audio_paths: List[str],
+        output_dir: Optional[str] = None,
+        batch_size: int = 8,
+        verbose: bool = True,
+        save_full: bool = False
+    ) -> List[Dict[str, any]]:
+        """
+        批量转录多个音频文件，所有文件共用同一个已加载的模型
+        
+        faster-whisper 后端使用 BatchedInferencePipeline，把每个文件切分出的语音片段
+        按 batch_size 组批送入编码器；openai-whisper 没有批量推理接口，逐个文件转录。
+        
+        Args:
+            audio_paths: 音频文件路径列表
+            output_dir: 输出目录，每个文件保存为 <文件名>.txt/.json，为 None 则不保存
+            batch_size: faster-whisper 每批推理的片段数
+            verbose: 是否显示详细信息
+            save_full: JSON 中是否保留完整结果（token、概率等调试信息）
+        
+        Returns:
+            转录结果列表，顺序与 audio_paths 一致
+        """
+        audio_paths = [Path(p) for p in audio_paths]
+        for audio_path in audio_paths:
+            if not audio_path.exists():
+                raise FileNotFoundError(f"音频文件不存在: {audio_path}")
+        
+        self._load_model()
+        
+        pipeline = None
+        if self.backend == "faster-whisper":
+            from faster_whisper import BatchedInferencePipeline
             
-            if verbose:
-                console.print(f"✓ 转录完成，已保存到: {text_path}", style="green")
+            pipeline = BatchedInferencePipeline(model=self.model)
+        
+        results = []
+        if not audio_paths:
+            return results
         
+        # 后台线程预先解码下一个文件，使 ffmpeg 解码与当前文件的推理重叠
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._load_audio, audio_paths[0])
+            for i, audio_path in enumerate(audio_paths, 1):
+                audio = pending.result()
+                if i < len(audio_paths):
+                    pending = executor.submit(self._load_audio, audio_paths[i])
+                
+                if verbose:
+                    console.print(f"正在转录 [{i}/{len(audio_paths)}]: {audio_path.name}", style="cyan")
+                
+                result = self._transcribe_audio(audio, pipeline, batch_size)
+                
+                if output_dir:
+                    self._save_result(result, Path(output_dir) / f"{audio_path.stem}.txt", verbose, save_full)
+                results.append(result)
+        
+        return results
+    
+    def _load_audio(self, audio_path: Path):
+        """
+        解码音频为 16kHz 单声道波形
+        
+        openai-whisper 后端返回位于内存中的张量（CUDA 上使用锁页内存，便于之后快速拷贝到显存），
+        faster-whisper 后端返回 numpy 数组。预取下一个文件时不会占用显存。
+        """
+        if self.backend == "faster-whisper":
+            from faster_whisper import decode_audio
+            return decode_audio(str(audio_path))
+        
+        import torch
+        import whisper
+        
+        audio = torch.from_numpy(whisper.load_audio(str(audio_path)))
+        return audio.pin_memory() if _device_type(self.device) == "cuda" else audio
+    
+    def _transcribe_audio(self, audio, pipeline=None, batch_size: Optional[int] = None) -> Dict[str, any]:
+        """转录已解码的音频波形"""
+        if self.backend == "faster-whisper":
+            return self._transcribe_faster_whisper(audio, pipeline, batch_size)
+        
+        offsets = None
+        if self.vad:
+            audio, offsets = _strip_silence(audio)
+        
+        # 不超过 GPU_MEL_MAX_SECONDS 的音频移到推理设备上，whisper 会在同一设备上计算 mel 频谱
+        # （GPU 上的 STFT 远快于 CPU）；更长的音频整段 STFT 占用显存过多，仍在 CPU 上计算
+        if _device_type(self.device) != "cpu" and len(audio) <= GPU_MEL_MAX_SECONDS * SAMPLE_RATE:
+            audio = audio.to(self.device, non_blocking=True)
+        
+        # CUDA 上使用 FP16 推理；CPU 和 MPS 使用 FP32
+        result = self.model.transcribe(
+            audio,
+            language=self.language,
+            verbose=False,
+            fp16=_device_type(self.device) == "cuda"
+        )
+        
+        if offsets:
+            _remap_timestamps(result, offsets)
         return result
     
+    def _save_result(
+        self,
+        result: Dict[str, any],
+        output_path: str,
+        verbose: bool = True,
+        save_full: bool = False
+    ):
+        """保存转录结果：纯文本 (.txt) 和包含时间戳的分段结果 (.json)"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 保存纯文本
+        text_path = output_path.with_suffix('.txt')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(result['text'])
+        
+        # 保存详细结果（包含时间戳）
+        _jsonio.write(output_path.with_suffix('.json'), result if save_full else _slim(result))
+        
+        if verbose:
+            console.print(f"✓ 转录完成，已保存到: {text_path}", style="green")
+    
+    def _transcribe_faster_whisper(
+        self,
+        audio,
+        pipeline=None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, any]:
+        """使用 faster-whisper 转录，结果整理为与 openai-whisper 相同的格式"""
+        if pipeline is None:
+            segments, info = self.model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=5,
+                vad_filter=True
+            )
+        else:
+            # 批量推理：按 VAD 切分的语音片段组批送入编码器
+            segments, info = pipeline.transcribe(
+                audio,
+                language=self.language,
+                beam_size=5,
+                batch_size=batch_size
+            )
+        
+        result_segments = []
+        for segment in segments:
+            result_segments.append({
+                'id': segment.id,
+                'seek': segment.seek,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'tokens': segment.tokens,
+                'temperature': segment.temperature,
+                'avg_logprob': segment.avg_logprob,
+                'compression_ratio': segment.compression_ratio,
+                'no_speech_prob': segment.no_speech_prob
+            })
+        
+        return {
+            'text': "".join(segment['text'] for segment in result_segments),
+            'segments': result_segments,
+            'language': info.language
+        }
+    
     def transcribe_with_timestamps(
         self,
         audio_path: str,
@@ -115,16 +427,7 @@ class AudioTranscriber:
             包含时间戳的片段列表
         """
         result = self.transcribe(audio_path, output_path, verbose=True)
-        
-        segments = []
-        for segment in result.get('segments', []):
-            segments.append({
-                'start': segment['start'],
-                'end': segment['end'],
-                'text': segment['text'].strip()
-            })
-        
-        return segments
+        return _slim_segments(result)
     
     def get_full_text(self, audio_path: str) -> str:
         """